@@ -1,9 +1,11 @@
-from flask import Flask, jsonify
+from flask import Flask, jsonify, request
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
 import os
+import asyncio
 import threading
 import time
-import json
+import orjson
 from datetime import datetime
 from dotenv import load_dotenv
 
@@ -12,7 +14,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from binance_api import BinanceAPI
-from indicators import calculate_all_indicators
+from binance_ws import BinanceWSClient
+from indicators import IndicatorWorkspace, calculate_all_indicators
 from auth import auth_bp
 from database import init_database
 
@@ -22,9 +25,31 @@ API_SECRET = os.getenv("BINANCE_API_SECRET", "")
 INTERVAL = os.getenv("INTERVAL", "1h")
 CANDLE_LIMIT = int(os.getenv("CANDLE_LIMIT", 200))
 UPDATE_INTERVAL = int(os.getenv("UPDATE_INTERVAL", 5))
+MAX_CONCURRENT_KLINES = int(os.getenv("MAX_CONCURRENT_KLINES", 10))
+MIN_UPDATE_INTERVAL = float(os.getenv("MIN_UPDATE_INTERVAL", 1))
+MAX_POLL_BACKOFF = int(os.getenv("MAX_POLL_BACKOFF", 10))
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Skip the bytes -> str -> bytes round trip of the default implementation
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY),
+            mimetype="application/json"
+        )
+
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 
 # Register authentication blueprint
@@ -36,6 +61,9 @@ init_database()
 # Initialize API client
 binance = BinanceAPI(API_KEY, API_SECRET)
 
+# Push updates for tickers, mark prices and top-asset klines; REST is the fallback
+stream = BinanceWSClient(binance, INTERVAL, CANDLE_LIMIT)
+
 # Global data storage
 current_data = {
     "most_liquid": None,
@@ -44,11 +72,59 @@ current_data = {
     "error": None
 }
 
-def get_symbol_indicators(symbol: str) -> dict:
+# Caps in-flight klines requests to stay within Binance request weight limits
+klines_semaphore = asyncio.Semaphore(MAX_CONCURRENT_KLINES)
+
+# Last computed indicators per (symbol, interval), keyed by the latest candle
+indicator_cache = {}
+
+# Scratch buffers shared by every indicator calculation on the update loop
+workspace = IndicatorWorkspace()
+
+# Monotonic time each symbol's klines are next due over REST
+klines_next_poll = {}
+
+
+def poll_backoff(volatility: float) -> float:
+    """
+    Number of update intervals to wait before polling a symbol's klines again
+
+    Symbols moving 1% or more over 24h are polled every cycle; quieter ones
+    back off proportionally, up to MAX_POLL_BACKOFF cycles.
+    """
+    if volatility <= 0:
+        return MAX_POLL_BACKOFF
+    return min(max(1 / volatility, 1), MAX_POLL_BACKOFF)
+
+
+async def get_symbol_indicators(symbol: str, volatility: float = 0.0) -> dict:
     """Get indicators for a specific symbol"""
     try:
-        klines = binance.get_klines(symbol, INTERVAL, CANDLE_LIMIT)
-        indicators = calculate_all_indicators(klines)
+        cache_key = (symbol, INTERVAL)
+        cached = indicator_cache.get(cache_key)
+
+        klines = stream.get_klines(symbol)
+        if klines is None:
+            # REST fallback: quiet symbols keep their last indicators until due
+            now = time.monotonic()
+            if cached and now < klines_next_poll.get(symbol, 0):
+                return {
+                    "symbol": symbol,
+                    "interval": INTERVAL,
+                    "indicators": cached[1],
+                }
+
+            async with klines_semaphore:
+                klines = await binance.get_klines(symbol, INTERVAL, CANDLE_LIMIT)
+            klines_next_poll[symbol] = now + UPDATE_INTERVAL * poll_backoff(volatility)
+
+        # Earlier candles are closed, so an unchanged last candle means unchanged indicators
+        last_candle = tuple(klines[-1]) if klines else None
+        if cached and last_candle is not None and cached[0] == last_candle:
+            indicators = cached[1]
+        else:
+            indicators = calculate_all_indicators(klines, workspace=workspace)
+            indicator_cache[cache_key] = (last_candle, indicators)
         
 
         return {
@@ -61,16 +137,16 @@ def get_symbol_indicators(symbol: str) -> dict:
         return None
 
 
-def get_most_liquid_indicators() -> dict:
-    """Get indicators for the most liquid asset"""
+async def get_most_liquid_indicators(most_liquid: dict) -> dict:
+    """Get indicators for the most liquid asset from the liquidity snapshot"""
     try:
-        most_liquid = binance.get_most_liquid_asset()
         symbol = most_liquid.get("symbol", "UNKNOWN")
         
-        result = get_symbol_indicators(symbol)
+        volatility = abs(float(most_liquid.get("price_change_24h", 0)))
+        result = await get_symbol_indicators(symbol, volatility)
         if result:
             # Attach liquidity data with mark price (from most_liquid)
-            liquidity_price = float(most_liquid.get("markPrice", most_liquid.get("lastPrice", 0)))
+            liquidity_price = most_liquid.get("price", 0)
             klines_price = result.get("indicators", {}).get("last_price", 0)
             
             # Use liquidity/mark price if klines price is 0
@@ -79,8 +155,8 @@ def get_most_liquid_indicators() -> dict:
             result["liquidity"] = {
                 "symbol": most_liquid.get("symbol", ""),
                 "price": final_price,
-                "volume_24h": float(most_liquid.get("quoteVolume", 0)),
-                "price_change_24h": float(most_liquid.get("priceChangePercent", 0)),
+                "volume_24h": float(most_liquid.get("volume_24h", 0)),
+                "price_change_24h": float(most_liquid.get("price_change_24h", 0)),
             }
 
         return result
@@ -89,16 +165,21 @@ def get_most_liquid_indicators() -> dict:
         return None
 
 
-def get_top_liquid_indicators(count: int = 5) -> list:
-    """Get indicators for multiple top liquid assets"""
+async def get_top_liquid_indicators(top_assets: list) -> list:
+    """Get indicators for multiple top liquid assets from the liquidity snapshot"""
     try:
-        top_assets = binance.get_top_liquid_assets(count)
-
+        # Fetch klines for all symbols concurrently
+        symbol_results = await asyncio.gather(
+            *(
+                get_symbol_indicators(asset["symbol"], abs(float(asset.get("price_change_24h", 0))))
+                for asset in top_assets
+            ),
+            return_exceptions=True
+        )
 
         results = []
-        for asset in top_assets:
-            result = get_symbol_indicators(asset["symbol"])
-            if result:
+        for asset, result in zip(top_assets, symbol_results):
+            if result and not isinstance(result, Exception):
                 # Attach liquidity data - this includes the price from mark price endpoint
                 liquidity_price = asset.get("price", 0)
                 klines_price = result.get("indicators", {}).get("last_price", 0)
@@ -122,17 +203,50 @@ def get_top_liquid_indicators(count: int = 5) -> list:
         return []
 
 
-def update_data():
-    """Background thread to update data continuously"""
+async def wait_for_next_update():
+    """
+    Wait until there is new data to process
+
+    While the stream is live this wakes on the next streamed change, then
+    waits MIN_UPDATE_INTERVAL so a burst of messages becomes one rebuild.
+    UPDATE_INTERVAL bounds the wait, and is the polling period when the
+    stream is down and data comes from REST.
+    """
+    if not stream.is_live:
+        await asyncio.sleep(UPDATE_INTERVAL)
+        return
+
+    try:
+        await asyncio.wait_for(stream.updated.wait(), timeout=UPDATE_INTERVAL)
+    except asyncio.TimeoutError:
+        return
+    await asyncio.sleep(MIN_UPDATE_INTERVAL)
+
+
+async def update_data():
+    """Background coroutine to rebuild data whenever new market data arrives"""
     global current_data
     
-    print("Background update thread started...", flush=True)
+    print("Background update loop started...", flush=True)
     
     while True:
+        # Changes that land while rebuilding trigger the next rebuild
+        stream.updated.clear()
         try:
-            # Updating indicators silently
-            most_liquid = get_most_liquid_indicators()
-            top_assets = get_top_liquid_indicators(5)
+            # One liquidity snapshot feeds both the most-liquid and top-N views
+            if stream.is_live:
+                snapshot = await stream.get_liquidity_snapshot(5)
+            else:
+                snapshot = await binance.get_liquidity_snapshot(5)
+
+            # Follow the current top assets' klines on the stream
+            await stream.watch_klines(asset["symbol"] for asset in snapshot)
+
+            # Updating indicators silently; both fetches share the event loop
+            most_liquid, top_assets = await asyncio.gather(
+                get_most_liquid_indicators(snapshot[0]),
+                get_top_liquid_indicators(snapshot[:5])
+            )
             
             current_data = {
                 "most_liquid": most_liquid,
@@ -145,7 +259,42 @@ def update_data():
             print(f"Error in update_data loop: {e}")
             current_data["error"] = str(e)
 
-        time.sleep(UPDATE_INTERVAL)
+        await wait_for_next_update()
+
+
+def run_update_loop():
+    """Run the background updater on a dedicated asyncio event loop"""
+    async def runner():
+        stream_task = asyncio.ensure_future(stream.run())
+        try:
+            await update_data()
+        finally:
+            stream_task.cancel()
+            await binance.close()
+
+    asyncio.run(runner())
+
+
+def conditional_json(select):
+    """
+    Serialize part of current_data with an ETag tied to the last update
+
+    Responds 304 Not Modified without serializing when the client already
+    holds this update. No ETag is sent before the first update or while the
+    updater is reporting an error.
+    """
+    data = current_data
+    etag = data.get("timestamp") if not data.get("error") else None
+
+    if etag and request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(select(data))
+
+    if etag:
+        response.set_etag(etag)
+        response.cache_control.max_age = UPDATE_INTERVAL
+    return response
 
 
 # API Routes
@@ -153,21 +302,19 @@ def update_data():
 @app.route('/api/indicators', methods=['GET'])
 def get_indicators():
     """Get current indicators data"""
-    return jsonify(current_data)
+    return conditional_json(lambda data: data)
 
 
 @app.route('/api/indicators/most-liquid', methods=['GET'])
 def get_most_liquid():
     """Get most liquid asset indicators"""
-    return jsonify(current_data.get("most_liquid"))
+    return conditional_json(lambda data: data.get("most_liquid"))
 
 
 @app.route('/api/indicators/top', methods=['GET'])
 def get_top():
     """Get top assets indicators"""
-    data = current_data.get("top_assets", [])
-
-    return jsonify(data)
+    return conditional_json(lambda data: data.get("top_assets", []))
 
 
 @app.route('/health', methods=['GET'])
@@ -188,12 +335,6 @@ def debug_data():
         "first_asset": current_data.get("top_assets", [])[0] if current_data.get("top_assets") else None
     })
 
-# Start background update thread when module loads (works with Gunicorn)
-update_thread = threading.Thread(target=update_data, daemon=True)
+# Start background update thread when module loads in the worker (see gunicorn.conf.py)
+update_thread = threading.Thread(target=run_update_loop, daemon=True)
 update_thread.start()
-
-
-if __name__ == "__main__":
-    # This block only runs when using `python api.py` directly
-    # The background thread is already started above
-    app.run(host="0.0.0.0", port=5000, debug=False)
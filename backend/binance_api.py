@@ -1,30 +1,110 @@
+import asyncio
+import heapq
 import hmac
 import hashlib
 import time
-import requests
-from typing import Dict, List, Optional
+import httpx
+import orjson
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Dict, Iterable, List, Optional
 from urllib.parse import urlencode
 
 BASE_URL = "https://fapi.binance.com"
 
+# Symbol status changes on the order of hours, so exchange info is reused
+SYMBOLS_CACHE_TTL = 300  # seconds
+
+
+@dataclass(slots=True)
+class Ticker:
+    """24h ticker with its numeric fields parsed once"""
+    symbol: str
+    quote_volume: float
+    last_price: float
+    price_change_percent: float
+
+    @classmethod
+    def from_rest(cls, ticker: Dict) -> "Ticker":
+        """Parse a /fapi/v1/ticker/24hr entry"""
+        return cls(
+            ticker["symbol"],
+            float(ticker.get("quoteVolume") or 0),
+            float(ticker.get("lastPrice") or 0),
+            float(ticker.get("priceChangePercent") or 0),
+        )
+
+
+def rank_liquid_assets(
+    tickers: Iterable[Ticker],
+    mark_prices: Dict[str, float],
+    count: int = 10
+) -> List[Dict]:
+    """
+    Rank pairs by 24h quote volume
+
+    Args:
+        tickers: Parsed 24h tickers, already filtered to active USDT pairs
+        mark_prices: Mark price per symbol, preferred over lastPrice
+        count: Number of assets to return
+
+    Returns:
+        List of assets sorted by liquidity, most liquid first
+    """
+    # Select the top N in O(N log count)
+    top_pairs = heapq.nlargest(count, tickers, key=attrgetter("quote_volume"))
+
+    if not top_pairs:
+        raise Exception("No USDT trading pairs found")
+
+    return [
+        {
+            "symbol": t.symbol,
+            "price": mark_prices.get(t.symbol, t.last_price),
+            "volume_24h": t.quote_volume,
+            "price_change_24h": t.price_change_percent,
+        }
+        for t in top_pairs
+    ]
+
 
 class BinanceAPI:
-    """Binance Futures API client without third-party dependencies"""
+    """Async Binance Futures API client built on httpx (HTTP/2, pooled connections)"""
 
     def __init__(self, api_key: str = "", api_secret: str = ""):
         self.api_key = api_key
         self.api_secret = api_secret
-        self.session = requests.Session()
+        self._secret_bytes = api_secret.encode()
+        # Created lazily so the client binds to the event loop that uses it
+        self.client: Optional[httpx.AsyncClient] = None
+        # (monotonic fetch time, TRADING symbols, TRADING USDT symbols)
+        self._symbols_cache = (0.0, None, frozenset())
+        self._symbols_refresh: Optional[asyncio.Task] = None
+        # Last klines window per (symbol, interval), refreshed incrementally
+        self._klines_cache: Dict[tuple, List[List]] = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it on first use"""
+        if self.client is None or self.client.is_closed:
+            # HTTP/2 multiplexes concurrent requests over one TLS connection
+            self.client = httpx.AsyncClient(
+                base_url=BASE_URL,
+                http2=True,
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            )
+        return self.client
+
+    async def close(self):
+        """Close the underlying HTTP client"""
+        if self.client is not None and not self.client.is_closed:
+            await self.client.aclose()
 
     def _generate_signature(self, query_string: str) -> str:
         """Generate HMAC-SHA256 signature for authenticated requests"""
-        return hmac.new(
-            self.api_secret.encode(),
-            query_string.encode(),
-            hashlib.sha256
-        ).hexdigest()
+        return hmac.digest(self._secret_bytes, query_string.encode(), hashlib.sha256).hex()
 
-    def _request(
+    async def _request(
         self,
         endpoint: str,
         method: str = "GET",
@@ -35,8 +115,6 @@ class BinanceAPI:
         if params is None:
             params = {}
 
-        url = f"{BASE_URL}{endpoint}"
-
         if requires_auth:
             params["timestamp"] = int(time.time() * 1000)
             query_string = urlencode(params)
@@ -51,38 +129,68 @@ class BinanceAPI:
             headers["X-MBX-APIKEY"] = self.api_key
 
         try:
-            response = self.session.request(
+            response = await self._get_client().request(
                 method,
-                url,
+                endpoint,
                 params=params,
-                headers=headers,
-                timeout=10
+                headers=headers
             )
             response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return orjson.loads(response.content)
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
             raise Exception(f"Request failed: {str(e)}")
 
-    def get_exchange_info(self) -> Dict:
+    async def get_exchange_info(self) -> Dict:
         """Get exchange information"""
-        return self._request("/fapi/v1/exchangeInfo")
+        return await self._request("/fapi/v1/exchangeInfo")
 
-    def get_trading_symbols(self) -> set:
-        """Get set of symbols that are currently TRADING"""
+    async def _refresh_trading_symbols(self) -> tuple:
+        """Fetch the TRADING symbols from exchange info and cache them"""
         try:
-            info = self.get_exchange_info()
-            return {
+            info = await self.get_exchange_info()
+            symbols = frozenset(
                 s["symbol"] for s in info.get("symbols", [])
                 if s.get("status") == "TRADING"
-            }
+            )
         except Exception:
-            return set()
+            # Serve the last known sets rather than dropping the filter
+            fetched_at, symbols, usdt_symbols = self._symbols_cache
+            return fetched_at, symbols or frozenset(), usdt_symbols
+
+        usdt_symbols = frozenset(s for s in symbols if s.endswith("USDT"))
+        self._symbols_cache = (time.monotonic(), symbols, usdt_symbols)
+        return self._symbols_cache
+
+    async def _get_symbols_cache(self) -> tuple:
+        """
+        Get the cached TRADING symbol sets
 
-    def get_24h_ticker_price_change(self) -> List[Dict]:
+        Exchange info is only awaited on the first call. After that the cached
+        sets are returned immediately and refreshed in the background once they
+        are older than SYMBOLS_CACHE_TTL.
+        """
+        cache = self._symbols_cache
+        if cache[1] is None:
+            return await self._refresh_trading_symbols()
+
+        refresh_idle = self._symbols_refresh is None or self._symbols_refresh.done()
+        if time.monotonic() - cache[0] >= SYMBOLS_CACHE_TTL and refresh_idle:
+            self._symbols_refresh = asyncio.ensure_future(self._refresh_trading_symbols())
+        return cache
+
+    async def get_trading_symbols(self) -> frozenset:
+        """Get set of symbols that are currently TRADING"""
+        return (await self._get_symbols_cache())[1]
+
+    async def get_usdt_trading_symbols(self) -> frozenset:
+        """Get set of USDT-quoted symbols that are currently TRADING"""
+        return (await self._get_symbols_cache())[2]
+
+    async def get_24h_ticker_price_change(self) -> List[Dict]:
         """Get 24h ticker data for all symbols"""
-        return self._request("/fapi/v1/ticker/24hr")
+        return await self._request("/fapi/v1/ticker/24hr")
 
-    def get_klines(
+    async def get_klines(
         self,
         symbol: str,
         interval: str = "1h",
@@ -90,6 +198,10 @@ class BinanceAPI:
     ) -> List[List]:
         """
         Get klines (candlestick) data
+
+        Once a full window is cached, only candles from the last cached open
+        time onwards are fetched and merged in: the still-open candle is
+        replaced and any newly opened candles are appended.
         
         Args:
             symbol: Trading pair (e.g., 'BTCUSDT')
@@ -104,124 +216,100 @@ class BinanceAPI:
             "interval": interval,
             "limit": limit,
         }
-        result = self._request("/fapi/v1/klines", params=params)
+
+        key = (symbol, interval)
+        cached = self._klines_cache.get(key)
+        if cached and len(cached) >= limit:
+            params["startTime"] = cached[-1][0]
+            delta = await self._request("/fapi/v1/klines", params=params)
+
+            # A full page means we fell too far behind; refetch the window
+            if delta and len(delta) < limit:
+                first_open_time = delta[0][0]
+                kept = [k for k in cached if k[0] < first_open_time]
+                result = (kept + delta)[-limit:]
+                self._klines_cache[key] = result
+                return result
+            del params["startTime"]
+
+        result = await self._request("/fapi/v1/klines", params=params)
+        if isinstance(result, list):
+            self._klines_cache[key] = result
         return result
 
-    def get_mark_price(self, symbol: str = None) -> Dict:
+    async def get_mark_price(self, symbol: str = None) -> Dict:
         """Get mark price for a symbol or all symbols (no auth required)"""
         params = {}
         if symbol:
             params["symbol"] = symbol
-            result = self._request("/fapi/v1/premiumIndex", params=params)
+            result = await self._request("/fapi/v1/premiumIndex", params=params)
             return result if isinstance(result, dict) else {}
         return {}
 
-    def get_all_mark_prices(self) -> List[Dict]:
+    async def get_all_mark_prices(self) -> List[Dict]:
         """Get mark prices for all symbols"""
-        result = self._request("/fapi/v1/premiumIndex")
+        result = await self._request("/fapi/v1/premiumIndex")
         return result if isinstance(result, list) else []
 
-    def get_price(self, symbol: str) -> Dict:
+    async def get_price(self, symbol: str) -> Dict:
         """Get current price of a symbol"""
         params = {"symbol": symbol}
-        return self._request("/fapi/v1/ticker/price", params=params)
+        return await self._request("/fapi/v1/ticker/price", params=params)
 
-    def get_most_liquid_asset(self) -> Dict:
-        """Get the most liquid asset (highest 24h volume in USDT)"""
-        try:
-            tickers = self.get_24h_ticker_price_change()
-
-            # Filter USDT pairs and get highest volume
-            usdt_pairs = [
-                ticker for ticker in tickers
-                if isinstance(ticker, dict) and ticker.get("symbol", "").endswith("USDT")
-            ]
-
-            if not usdt_pairs:
-                raise Exception("No USDT trading pairs found")
-
-            # Get trading symbols
-            trading_symbols = self.get_trading_symbols()
-
-            # Filter for trading symbols only
-            active_usdt_pairs = [
-                p for p in usdt_pairs 
-                if p.get("symbol") in trading_symbols
-            ]
-            
-            if not active_usdt_pairs:
-                # Fallback to original list if filter fails (unlikely)
-                active_usdt_pairs = usdt_pairs
-
-            # Sort by quote asset volume (24h volume in USDT)
-            most_liquid = max(
-                active_usdt_pairs,
-                key=lambda x: float(x.get("quoteVolume") or 0)
-            )
+    async def get_liquidity_snapshot(self, count: int = 10) -> List[Dict]:
+        """
+        Get the top USDT pairs by 24h quote volume in a single pass
 
-            # Get mark price for this symbol
-            symbol = most_liquid.get("symbol")
-            try:
-                mark_price_data = self.get_mark_price(symbol)
-                if mark_price_data and "markPrice" in mark_price_data:
-                    most_liquid["markPrice"] = mark_price_data.get("markPrice")
-            except Exception:
-                pass
-            return most_liquid
+        Tickers, exchange info and mark prices are each fetched once, so the
+        most liquid asset (first entry) and the top-N list come from the same
+        data.
 
-        except Exception as e:
-            raise Exception(f"Failed to get most liquid asset: {str(e)}")
+        Args:
+            count: Number of assets to return
 
-    def get_top_liquid_assets(self, count: int = 10) -> List[Dict]:
-        """Get multiple symbols sorted by liquidity"""
+        Returns:
+            List of assets sorted by liquidity, most liquid first
+        """
         try:
-            tickers = self.get_24h_ticker_price_change()
-
-            usdt_pairs = [
-                ticker for ticker in tickers
-                if ticker.get("symbol", "").endswith("USDT")
-            ]
-
-            # Get trading symbols
-            trading_symbols = self.get_trading_symbols()
-
-            # Filter for trading symbols only
-            active_usdt_pairs = [
-                p for p in usdt_pairs 
-                if p.get("symbol") in trading_symbols
-            ]
-
-            # Sort by quote asset volume and get top N
-            sorted_pairs = sorted(
-                active_usdt_pairs,
-                key=lambda x: float(x.get("quoteVolume") or 0),
-                reverse=True
-            )[:count]
-
-            # Get mark prices for these symbols
+            tickers, usdt_symbols, all_mark_prices = await asyncio.gather(
+                self.get_24h_ticker_price_change(),
+                self.get_usdt_trading_symbols(),
+                self.get_all_mark_prices(),
+                return_exceptions=True
+            )
+            if isinstance(tickers, Exception):
+                raise tickers
+
             mark_prices = {}
-            try:
-                all_mark_prices = self.get_all_mark_prices()
+            if not isinstance(all_mark_prices, Exception):
                 for mp in all_mark_prices:
                     symbol = mp.get("symbol")
                     mark_price = float(mp.get("markPrice", 0))
                     mark_prices[symbol] = mark_price
-            except Exception:
-                pass
-
-            results = []
-            for ticker in sorted_pairs:
-                symbol = ticker.get("symbol", "")
-                price = mark_prices.get(symbol, float(ticker.get("lastPrice", 0)))
-                
-                results.append({
-                    "symbol": symbol,
-                    "price": price,
-                    "volume_24h": float(ticker.get("quoteVolume") or 0),
-                    "price_change_24h": float(ticker.get("priceChangePercent", 0)),
-                })
-
-            return results
 
+            # Filter and parse in a single pass
+            parsed = [Ticker.from_rest(t) for t in tickers if t.get("symbol") in usdt_symbols]
+            if not parsed:
+                # Fallback to every USDT pair if exchange info is unavailable (unlikely)
+                parsed = [
+                    Ticker.from_rest(t) for t in tickers
+                    if t.get("symbol", "").endswith("USDT")
+                ]
+            return rank_liquid_assets(parsed, mark_prices, count)
+
+        except Exception as e:
+            raise Exception(f"Failed to get liquidity snapshot: {str(e)}")
+
+    async def get_most_liquid_asset(self) -> Dict:
+        """Get the most liquid asset (highest 24h volume in USDT)"""
+        try:
+            return (await self.get_liquidity_snapshot(1))[0]
+        except Exception as e:
+            raise Exception(f"Failed to get most liquid asset: {str(e)}")
+
+    async def get_top_liquid_assets(self, count: int = 10) -> List[Dict]:
+        """Get multiple symbols sorted by liquidity"""
+        try:
+            return await self.get_liquidity_snapshot(count)
         except Exception as e:
             raise Exception(f"Failed to get top liquid assets: {str(e)}")
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import orjson
+import websockets
+from typing import Dict, Iterable, List, Optional
+
+from binance_api import BinanceAPI, Ticker, rank_liquid_assets
+
+logger = logging.getLogger(__name__)
+
+STREAM_URL = "wss://fstream.binance.com/stream"
+
+# Market-wide streams; per-symbol kline streams are added on demand
+MARKET_STREAMS = ["!ticker@arr", "!markPrice@arr@1s"]
+
+RECONNECT_DELAY_MAX = 60  # seconds
+
+
+class BinanceWSClient:
+    """Binance Futures combined-stream client keeping tickers, mark prices and klines in memory"""
+
+    def __init__(self, rest: BinanceAPI, interval: str = "1h", limit: int = 200):
+        self.rest = rest
+        self.interval = interval
+        self.limit = limit
+        # Latest 24h ticker per symbol, parsed on arrival
+        self.tickers: Dict[str, Ticker] = {}
+        self.mark_prices: Dict[str, float] = {}
+        # Klines window per watched symbol, in REST row format
+        self.klines: Dict[str, List[List]] = {}
+        self.kline_symbols: set = set()
+        self._ws = None
+        self._request_id = 0
+        # Set whenever streamed data changes; consumers clear it before reading
+        self.updated = asyncio.Event()
+
+    @property
+    def is_live(self) -> bool:
+        """True once connected and seeded with market data"""
+        return self._ws is not None and bool(self.tickers)
+
+    def _kline_stream(self, symbol: str) -> str:
+        return f"{symbol.lower()}@kline_{self.interval}"
+
+    def _stream_url(self) -> str:
+        streams = MARKET_STREAMS + [self._kline_stream(s) for s in sorted(self.kline_symbols)]
+        return f"{STREAM_URL}?streams={'/'.join(streams)}"
+
+    async def _send(self, method: str, streams: List[str]):
+        """Send a SUBSCRIBE/UNSUBSCRIBE request on the open connection"""
+        if self._ws is None or not streams:
+            return
+        self._request_id += 1
+        await self._ws.send(orjson.dumps({
+            "method": method,
+            "params": streams,
+            "id": self._request_id,
+        }).decode())
+
+    async def _seed_klines(self, symbol: str):
+        """Load the klines window for a symbol over REST"""
+        try:
+            window = await self.rest.get_klines(symbol, self.interval, self.limit)
+        except Exception as e:
+            logger.warning(f"Failed to seed klines for {symbol}: {str(e)}")
+            return
+        if symbol in self.kline_symbols:
+            # Copy so stream updates never touch the REST client's cache
+            self.klines[symbol] = list(window)
+
+    async def _resync(self):
+        """Reload state over REST after (re)connecting, since updates may have been missed"""
+        tickers, mark_prices = await asyncio.gather(
+            self.rest.get_24h_ticker_price_change(),
+            self.rest.get_all_mark_prices()
+        )
+        self.tickers = {
+            t["symbol"]: Ticker.from_rest(t) for t in tickers if isinstance(t, dict) and "symbol" in t
+        }
+        self.mark_prices = {
+            mp["symbol"]: float(mp.get("markPrice", 0)) for mp in mark_prices if "symbol" in mp
+        }
+        await asyncio.gather(*(self._seed_klines(s) for s in self.kline_symbols))
+
+    def _apply_tickers(self, events: List[Dict]):
+        for e in events:
+            self.tickers[e["s"]] = Ticker(e["s"], float(e["q"]), float(e["c"]), float(e["P"]))
+
+    def _apply_mark_prices(self, events: List[Dict]):
+        for e in events:
+            self.mark_prices[e["s"]] = float(e["p"])
+
+    def _apply_kline(self, event: Dict):
+        window = self.klines.get(event["s"])
+        if not window:
+            return
+
+        k = event["k"]
+        row = [k["t"], k["o"], k["h"], k["l"], k["c"], k["v"], k["T"], k["q"], k["n"], k["V"], k["Q"], k["B"]]
+        if row[0] == window[-1][0]:
+            # Update to the still-open candle
+            window[-1] = row
+        elif row[0] > window[-1][0]:
+            window.append(row)
+            if len(window) > self.limit:
+                del window[0]
+
+    def _handle_message(self, message: Dict):
+        stream = message.get("stream")
+        data = message.get("data")
+        if stream is None or data is None:
+            # Subscription acknowledgements
+            return
+
+        if stream == "!ticker@arr":
+            self._apply_tickers(data)
+        elif stream.startswith("!markPrice@arr"):
+            self._apply_mark_prices(data)
+        elif "@kline_" in stream:
+            self._apply_kline(data)
+        else:
+            return
+        self.updated.set()
+
+    async def run(self):
+        """Consume the combined stream forever, reconnecting with backoff"""
+        delay = 1
+        while True:
+            try:
+                async with websockets.connect(self._stream_url(), max_size=None) as ws:
+                    self._ws = ws
+                    await self._resync()
+                    self.updated.set()
+                    delay = 1
+                    logger.info("Binance stream connected")
+                    async for raw in ws:
+                        self._handle_message(orjson.loads(raw))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Binance stream error: {str(e)}")
+            finally:
+                self._ws = None
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_DELAY_MAX)
+
+    async def watch_klines(self, symbols: Iterable[str]):
+        """Follow kline streams for exactly these symbols, seeding new ones over REST"""
+        wanted = set(symbols)
+        added = wanted - self.kline_symbols
+        removed = self.kline_symbols - wanted
+        if not added and not removed:
+            return
+
+        self.kline_symbols = wanted
+        for symbol in removed:
+            self.klines.pop(symbol, None)
+
+        # Subscribe before seeding so no update after the REST snapshot is lost
+        await self._send("UNSUBSCRIBE", [self._kline_stream(s) for s in removed])
+        await self._send("SUBSCRIBE", [self._kline_stream(s) for s in added])
+        await asyncio.gather(*(self._seed_klines(s) for s in added))
+
+    def get_klines(self, symbol: str) -> Optional[List[List]]:
+        """Get the streamed klines window for a symbol, or None if not live"""
+        if not self.is_live:
+            return None
+        return self.klines.get(symbol)
+
+    async def get_liquidity_snapshot(self, count: int = 10) -> List[Dict]:
+        """Rank assets by liquidity from streamed tickers and mark prices"""
+        usdt_symbols = await self.rest.get_usdt_trading_symbols()
+        tickers = [t for t in self.tickers.values() if t.symbol in usdt_symbols]
+        if not tickers:
+            # Fallback to every USDT pair if exchange info is unavailable (unlikely)
+            tickers = [t for t in self.tickers.values() if t.symbol.endswith("USDT")]
+        return rank_liquid_assets(tickers, self.mark_prices, count)
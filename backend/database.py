@@ -1,9 +1,13 @@
 import os
 import time
+import threading
 import pymysql
 from pymysql.cursors import DictCursor
+from dbutils.pooled_db import PooledDB
 import bcrypt
 import logging
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
@@ -19,13 +23,47 @@ DB_CONFIG = {
     'cursorclass': DictCursor
 }
 
+# bcrypt cost factor; 10 rounds hashes ~4x faster than the library default of 12.
+# Existing hashes keep verifying since the cost is stored in each hash.
+BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 10))
+
+# bcrypt releases the GIL, so hashing runs on a small dedicated pool; this caps how
+# many cores a burst of logins/registrations can take from the API and updater threads
+_password_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('PASSWORD_HASH_WORKERS', 4)),
+    thread_name_prefix='bcrypt'
+)
+
+# User rows by ID; id/username/email never change after registration
+_user_cache = TTLCache(maxsize=1024, ttl=60)
+_user_cache_lock = threading.Lock()
+
+
+# Shared connection pool, created on first use so import doesn't require MySQL
+_pool = None
+
+
+def get_pool() -> PooledDB:
+    """Get the shared MySQL connection pool"""
+    global _pool
+    if _pool is None:
+        _pool = PooledDB(
+            creator=pymysql,
+            mincached=2,
+            maxcached=10,
+            maxconnections=20,
+            blocking=True,
+            **DB_CONFIG
+        )
+    return _pool
+
 
 @contextmanager
 def get_db_connection():
-    """Context manager for database connections"""
+    """Context manager for pooled database connections"""
     connection = None
     try:
-        connection = pymysql.connect(**DB_CONFIG)
+        connection = get_pool().connection()
         yield connection
         connection.commit()
     except Exception as e:
@@ -35,6 +73,7 @@ def get_db_connection():
         raise
     finally:
         if connection:
+            # Returns the connection to the pool
             connection.close()
 
 
@@ -78,13 +117,16 @@ class User:
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash a password using bcrypt"""
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+        hashed = _password_executor.submit(bcrypt.hashpw, password.encode('utf-8'), salt).result()
+        return hashed.decode('utf-8')
     
     @staticmethod
     def verify_password(password: str, password_hash: str) -> bool:
         """Verify a password against its hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+        return _password_executor.submit(
+            bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8')
+        ).result()
     
     @staticmethod
     def create(username: str, email: str, password: str) -> dict:
@@ -132,7 +174,12 @@ class User:
     
     @staticmethod
     def find_by_id(user_id: int) -> dict:
-        """Find a user by ID"""
+        """Find a user by ID (cached for 60 seconds)"""
+        with _user_cache_lock:
+            user = _user_cache.get(user_id)
+        if user is not None:
+            return user
+
         try:
             with get_db_connection() as conn:
                 with conn.cursor() as cursor:
@@ -140,10 +187,16 @@ class User:
                         "SELECT id, username, email, created_at FROM users WHERE id = %s",
                         (user_id,)
                     )
-                    return cursor.fetchone()
+                    user = cursor.fetchone()
         except Exception as e:
             logger.error(f"Error finding user by ID: {str(e)}")
             return None
+
+        # Misses aren't cached so a lookup failure doesn't stick for the TTL
+        if user:
+            with _user_cache_lock:
+                _user_cache[user_id] = user
+        return user
     
     @staticmethod
     def find_by_username(username: str) -> dict:
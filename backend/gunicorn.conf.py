@@ -0,0 +1,19 @@
+import os
+from dotenv import load_dotenv
+
+# Same .env the app reads, so GUNICORN_* can be set there too
+load_dotenv()
+
+bind = "0.0.0.0:5000"
+
+# Market data lives in worker memory and every worker runs its own Binance
+# updater, so scale with threads rather than processes. bcrypt releases the
+# GIL, so password hashing still spreads across cores from a single worker.
+workers = int(os.getenv("GUNICORN_WORKERS", 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+timeout = 120
+
+# api.py starts the updater thread on import; preloading would start it in the
+# master, where it does not survive the fork into workers
+preload_app = False
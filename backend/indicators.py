@@ -1,14 +1,38 @@
-import pandas as pd
+import math
 import numpy as np
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+import indicators_nb
 
-def calculate_sma(prices: pd.Series, period: int) -> Optional[float]:
+
+@dataclass(slots=True)
+class IndicatorWorkspace:
+    """
+    Scratch buffers for the true range and price changes, reused across calls
+
+    Buffers are (rows, bars) and only grow, so a workspace sized for the
+    usual klines window stops allocating after the first update. Results
+    never reference the buffers; a workspace can serve any number of
+    calls, but only one at a time.
+    """
+    true_range: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+    deltas: np.ndarray = field(default_factory=lambda: np.empty((0, 0)))
+
+    def reserve(self, rows: int, bars: int):
+        """Make room for at least rows symbols of bars candles"""
+        if rows > self.true_range.shape[0] or bars > self.true_range.shape[1]:
+            shape = (max(rows, self.true_range.shape[0]), max(bars, self.true_range.shape[1]))
+            self.true_range = np.empty(shape)
+            self.deltas = np.empty(shape)
+
+
+def calculate_sma(prices: np.ndarray, period: int) -> Optional[float]:
     """
     Calculate Simple Moving Average (SMA)
     
     Args:
-        prices: Series of prices
+        prices: Array of prices
         period: Number of periods for SMA
         
     Returns:
@@ -16,15 +40,16 @@ def calculate_sma(prices: pd.Series, period: int) -> Optional[float]:
     """
     if len(prices) < period:
         return None
-    return prices.tail(period).mean()
+    # Trailing window is a view, so no copy is made
+    return float(prices[-period:].sum() / period)
 
 
-def calculate_all_smas(prices: pd.Series, periods: List[int] = None) -> Dict[str, Optional[float]]:
+def calculate_all_smas(prices: np.ndarray, periods: List[int] = None) -> Dict[str, Optional[float]]:
     """
     Calculate all SMAs for different periods
     
     Args:
-        prices: Series of prices
+        prices: Array of prices
         periods: List of periods to calculate
         
     Returns:
@@ -33,181 +58,124 @@ def calculate_all_smas(prices: pd.Series, periods: List[int] = None) -> Dict[str
     if periods is None:
         periods = [20, 50, 200]
     
-    smas = {}
-    for period in periods:
-        smas[f"sma{period}"] = calculate_sma(prices, period)
-    return smas
+    means = indicators_nb.trailing_means(prices, np.asarray(periods, dtype=np.int64)).tolist()
+    return {
+        f"sma{period}": mean if len(prices) >= period else None
+        for period, mean in zip(periods, means)
+    }
 
 
-def calculate_rsi(prices: pd.Series, period: int = 14) -> Optional[float]:
+def calculate_rsi(deltas: np.ndarray, period: int = 14) -> Optional[float]:
     """
     Calculate Relative Strength Index (RSI)
     
     Args:
-        prices: Series of prices
+        deltas: Array of close-to-close price changes
         period: Number of periods (typically 14)
         
     Returns:
-        RSI value (0-100) or None if insufficient data
+        RSI value (0-100), NaN if undefined, or None if insufficient data
     """
-    if len(prices) < period + 1:
+    if len(deltas) < period:
         return None
     
-    # Calculate price changes
-    deltas = prices.diff()
-    
-    # Separate gains and losses
-    gains = deltas.clip(lower=0)
-    losses = -deltas.clip(upper=0)
-    
-    # Calculate smoothed averages (Wilder's smoothing)
-    avg_gain = gains.rolling(window=period).mean()
-    avg_loss = losses.rolling(window=period).mean()
-    
-    # Smooth using exponential moving average
-    avg_gain = avg_gain.ewm(span=period, adjust=False).mean()
-    avg_loss = avg_loss.ewm(span=period, adjust=False).mean()
-    
-    # Calculate RS and RSI
-    rs = avg_gain / avg_loss
-    rsi = 100 - (100 / (1 + rs))
-    
-    return float(rsi.iloc[-1]) if not pd.isna(rsi.iloc[-1]) else None
+    return indicators_nb.rsi(deltas, period)
 
 
-def calculate_atr(df: pd.DataFrame, period: int = 14) -> Optional[float]:
+def calculate_atr(true_range: np.ndarray, period: int = 14) -> Optional[float]:
     """
     Calculate Average True Range (ATR)
     
     Args:
-        df: DataFrame with 'high', 'low', 'close' columns
+        true_range: Array of true ranges (see indicators_nb.true_range)
         period: Number of periods (typically 14)
         
     Returns:
-        ATR value or None if insufficient data
+        ATR value, NaN if undefined, or None if insufficient data
     """
-    if len(df) < period:
+    if len(true_range) < period:
         return None
     
-    # Calculate true ranges
-    high_low = df['high'] - df['low']
-    high_close = abs(df['high'] - df['close'].shift(1))
-    low_close = abs(df['low'] - df['close'].shift(1))
-    
-    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    
-    # Calculate ATR using smoothed average
-    atr = true_range.rolling(window=period).mean()
-    atr = atr.ewm(span=period, adjust=False).mean()
-    
-    return float(atr.iloc[-1]) if not pd.isna(atr.iloc[-1]) else None
+    return indicators_nb.atr(true_range, period)
 
 
-def calculate_adx(df: pd.DataFrame, period: int = 14) -> Optional[float]:
+def calculate_adx(
+    high: np.ndarray,
+    low: np.ndarray,
+    true_range: np.ndarray,
+    period: int = 14
+) -> Optional[float]:
     """
     Calculate ADX (Average Directional Index)
     
     Args:
-        df: DataFrame with 'high', 'low', 'close' columns
+        high: Array of high prices
+        low: Array of low prices
+        true_range: Array of true ranges (see indicators_nb.true_range)
         period: Number of periods (typically 14)
         
     Returns:
-        ADX value or None if insufficient data
+        ADX value, NaN if undefined, or None if insufficient data
     """
-    if len(df) < period * 2:
+    if len(high) < period * 2:
         return None
     
-    # Calculate directional movements
-    high_diff = df['high'].diff()
-    low_diff = -df['low'].diff()
-    
-    plus_dm = pd.Series(0.0, index=df.index)
-    minus_dm = pd.Series(0.0, index=df.index)
-    
-    for i in range(1, len(df)):
-        if high_diff.iloc[i] > 0 and high_diff.iloc[i] > low_diff.iloc[i]:
-            plus_dm.iloc[i] = high_diff.iloc[i]
-        if low_diff.iloc[i] > 0 and low_diff.iloc[i] > high_diff.iloc[i]:
-            minus_dm.iloc[i] = low_diff.iloc[i]
-    
-    # Calculate true range
-    high_low = df['high'] - df['low']
-    high_close = abs(df['high'] - df['close'].shift(1))
-    low_close = abs(df['low'] - df['close'].shift(1))
-    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    
-    # Smooth directional movements and true range
-    smoothed_plus_dm = plus_dm.rolling(window=period).sum().ewm(span=period, adjust=False).mean()
-    smoothed_minus_dm = minus_dm.rolling(window=period).sum().ewm(span=period, adjust=False).mean()
-    smoothed_tr = true_range.rolling(window=period).sum().ewm(span=period, adjust=False).mean()
-    
-    # Calculate directional indicators
-    di_plus = (smoothed_plus_dm / smoothed_tr) * 100
-    di_minus = (smoothed_minus_dm / smoothed_tr) * 100
-    
-    # Calculate DX
-    dx = (abs(di_plus - di_minus) / (di_plus + di_minus)) * 100
-    
-    # ADX is smoothed DX
-    adx = dx.ewm(span=period, adjust=False).mean()
-    
-    return float(adx.iloc[-1]) if not pd.isna(adx.iloc[-1]) else None
+    return indicators_nb.adx(high, low, true_range, period)
 
 
-def calculate_macd(prices: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Optional[Dict]:
+def calculate_macd(prices: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Optional[Dict]:
     """
     Calculate MACD (Moving Average Convergence Divergence)
     
     Args:
-        prices: Series of prices
+        prices: Array of prices
         fast: Fast EMA period (typically 12)
         slow: Slow EMA period (typically 26)
         signal: Signal line period (typically 9)
         
     Returns:
-        Dictionary with MACD, Signal, and Histogram values
+        Dictionary with MACD, Signal, and Histogram values (NaN if undefined)
     """
     if len(prices) < slow:
         return None
     
-    ema_fast = prices.ewm(span=fast, adjust=False).mean()
-    ema_slow = prices.ewm(span=slow, adjust=False).mean()
-    macd = ema_fast - ema_slow
-    macd_signal = macd.ewm(span=signal, adjust=False).mean()
-    macd_histogram = macd - macd_signal
+    macd, macd_signal, macd_histogram = indicators_nb.macd(prices, fast, slow, signal)
     
     return {
-        "macd": float(macd.iloc[-1]) if not pd.isna(macd.iloc[-1]) else None,
-        "signal": float(macd_signal.iloc[-1]) if not pd.isna(macd_signal.iloc[-1]) else None,
-        "histogram": float(macd_histogram.iloc[-1]) if not pd.isna(macd_histogram.iloc[-1]) else None,
+        "macd": macd,
+        "signal": macd_signal,
+        "histogram": macd_histogram,
     }
 
 
-def calculate_bollinger_bands(prices: pd.Series, period: int = 20, std_dev: float = 2.0) -> Optional[Dict]:
+def calculate_bollinger_bands(prices: np.ndarray, period: int = 20, std_dev: float = 2.0) -> Optional[Dict]:
     """
     Calculate Bollinger Bands
     
     Args:
-        prices: Series of prices
+        prices: Array of prices
         period: Period for moving average (typically 20)
         std_dev: Number of standard deviations (typically 2.0)
         
     Returns:
-        Dictionary with upper, middle, and lower band values
+        Dictionary with upper, middle, and lower band values (NaN if undefined)
     """
     if len(prices) < period:
         return None
     
-    sma = prices.rolling(window=period).mean()
-    std = prices.rolling(window=period).std()
+    # Only the latest bands are reported, so use the last window directly
+    window = prices[-period:]
+    sma = float(window.sum()) / period
+    # Sample std (ddof=1) around the mean above; np.std would compute the mean again
+    std = math.sqrt(float(np.square(window - sma).sum()) / (period - 1)) if period > 1 else math.nan
     
     upper_band = sma + (std * std_dev)
     lower_band = sma - (std * std_dev)
     
     return {
-        "upper": float(upper_band.iloc[-1]) if not pd.isna(upper_band.iloc[-1]) else None,
-        "middle": float(sma.iloc[-1]) if not pd.isna(sma.iloc[-1]) else None,
-        "lower": float(lower_band.iloc[-1]) if not pd.isna(lower_band.iloc[-1]) else None,
+        "upper": upper_band,
+        "middle": sma,
+        "lower": lower_band,
     }
 
 
@@ -215,7 +183,8 @@ def calculate_all_indicators(
     klines: List[List],
     sma_periods: List[int] = None,
     rsi_period: int = 14,
-    adx_period: int = 14
+    adx_period: int = 14,
+    workspace: IndicatorWorkspace = None
 ) -> Dict:
     """
     Calculate all indicators from klines data
@@ -225,6 +194,7 @@ def calculate_all_indicators(
         sma_periods: Periods for SMA calculation
         rsi_period: Period for RSI calculation
         adx_period: Period for ADX calculation
+        workspace: Scratch buffers to reuse; a fresh one is used if omitted
         
     Returns:
         Dictionary with all indicators
@@ -242,58 +212,163 @@ def calculate_all_indicators(
             "timestamp": 0,
         }
     
-    # Convert klines to DataFrame
-    df = pd.DataFrame(
+    high, low, close = _parse_klines(klines)
+    
+    if workspace is None:
+        workspace = IndicatorWorkspace()
+    workspace.reserve(1, len(klines))
+    
+    # Shared inputs: true range feeds ATR and ADX, price changes feed RSI
+    true_range = indicators_nb.true_range(high, low, close, workspace.true_range[0])
+    deltas = indicators_nb.diff(close, workspace.deltas[0])
+    
+    return _format_indicators(
         klines,
-        columns=[
-            'open_time', 'open', 'high', 'low', 'close', 'volume',
-            'close_time', 'quote_asset_volume', 'number_of_trades',
-            'taker_buy_base_asset_volume', 'taker_buy_quote_asset_volume', 'ignore'
-        ]
+        close,
+        smas=calculate_all_smas(close, sma_periods),
+        rsi=calculate_rsi(deltas, rsi_period),
+        adx=calculate_adx(high, low, true_range, adx_period),
+        macd=calculate_macd(close),
+        bollinger=calculate_bollinger_bands(close),
+        atr=calculate_atr(true_range),
     )
+
+
+def calculate_all_indicators_batch(
+    klines_list: List[List[List]],
+    sma_periods: List[int] = None,
+    rsi_period: int = 14,
+    adx_period: int = 14,
+    workspace: IndicatorWorkspace = None
+) -> List[Dict]:
+    """
+    Calculate all indicators for several symbols at once
     
-    # Convert to numeric types
-    df['open'] = pd.to_numeric(df['open'])
-    df['high'] = pd.to_numeric(df['high'])
-    df['low'] = pd.to_numeric(df['low'])
-    df['close'] = pd.to_numeric(df['close'])
-    df['volume'] = pd.to_numeric(df['volume'])
+    Windows with the same number of bars are stacked into (symbols, bars)
+    arrays and go through a single parallel kernel call. Results match
+    calculate_all_indicators for each window.
     
-    # Calculate indicators
-    closes = df['close']
-    last_price = float(closes.iloc[-1])
+    Args:
+        klines_list: One list of klines per symbol
+        sma_periods: Periods for SMA calculation
+        rsi_period: Period for RSI calculation
+        adx_period: Period for ADX calculation
+        workspace: Scratch buffers to reuse; a fresh one is used if omitted
+        
+    Returns:
+        List of indicator dictionaries, in the order of klines_list
+    """
+    if sma_periods is None:
+        sma_periods = [20, 50, 200]
     
-    smas = calculate_all_smas(closes, sma_periods)
-    rsi = calculate_rsi(closes, rsi_period)
-    adx = calculate_adx(df, adx_period)
-    macd = calculate_macd(closes)
-    bollinger = calculate_bollinger_bands(closes)
-    atr = calculate_atr(df)
+    if workspace is None:
+        workspace = IndicatorWorkspace()
+    
+    results = [None] * len(klines_list)
+    groups = {}
+    for i, klines in enumerate(klines_list):
+        if klines:
+            groups.setdefault(len(klines), []).append(i)
+        else:
+            results[i] = calculate_all_indicators(klines, sma_periods, rsi_period, adx_period, workspace)
+    
+    for bars, indices in groups.items():
+        high, low, close = np.stack([_parse_klines(klines_list[i]) for i in indices], axis=1)
+        workspace.reserve(len(indices), bars)
+        # ATR and MACD use the calculate_atr / calculate_macd default periods
+        latest = indicators_nb.batch_latest_values(
+            high, low, close, workspace.true_range, workspace.deltas,
+            rsi_period, adx_period, 14, 12, 26, 9
+        ).tolist()
+        
+        for row, i in enumerate(indices):
+            rsi, atr, adx, macd, macd_signal, macd_histogram = latest[row]
+            results[i] = _format_indicators(
+                klines_list[i],
+                close[row],
+                smas=calculate_all_smas(close[row], sma_periods),
+                # Same minimum bar counts as the calculate_* functions
+                rsi=rsi if bars >= rsi_period + 1 else None,
+                adx=adx if bars >= adx_period * 2 else None,
+                macd={
+                    "macd": macd,
+                    "signal": macd_signal,
+                    "histogram": macd_histogram,
+                } if bars >= 26 else None,
+                bollinger=calculate_bollinger_bands(close[row]),
+                atr=atr if bars >= 14 else None,
+            )
+    
+    return results
+
+
+def _parse_klines(klines: List[List]) -> np.ndarray:
+    """Parse high, low and close into a (3, bars) float64 array with contiguous rows"""
+    # Only the columns the indicators read are parsed, each straight from the rows
+    return np.array(
+        [
+            [k[2] for k in klines],
+            [k[3] for k in klines],
+            [k[4] for k in klines],
+        ],
+        dtype=np.float64
+    )
+
+
+def _none_if_nan(value: Optional[float]) -> Optional[float]:
+    """NaN results are reported as None"""
+    return None if value is None or math.isnan(value) else value
+
+
+def _none_if_nan_values(values: Optional[Dict]) -> Optional[Dict]:
+    """_none_if_nan applied to each value of a result dictionary"""
+    if values is None:
+        return None
+    return {key: _none_if_nan(value) for key, value in values.items()}
+
+
+def _format_indicators(
+    klines: List[List],
+    close: np.ndarray,
+    smas: Dict[str, Optional[float]],
+    rsi: Optional[float],
+    adx: Optional[float],
+    macd: Optional[Dict],
+    bollinger: Optional[Dict],
+    atr: Optional[float]
+) -> Dict:
+    """
+    Build the indicators dictionary from computed values
+    
+    The calculations report undefined values as NaN; they become None here,
+    in one place, instead of being checked after every calculation.
+    """
+    last_price = float(close[-1])
     
     # Format SMA values with human-readable comparisons
     sma_analysis = {}
     for period, sma_value in smas.items():
-        if sma_value is not None:
-            sma_value = float(sma_value)
+        if _none_if_nan(sma_value) is not None:
             diff = last_price - sma_value
             diff_percent = (diff / sma_value * 100) if sma_value != 0 else 0
             
             sma_analysis[period] = {
-                "value": round(sma_value, 8),
-                "difference": round(diff, 8),
-                "difference_percent": round(diff_percent, 2),
+                "value": sma_value,
+                "difference": diff,
+                "difference_percent": diff_percent,
                 "status": "above" if diff > 0 else "below" if diff < 0 else "equal",
             }
         else:
             sma_analysis[period] = None
     
+    # Values are full precision; clients round for display
     return {
         "sma": sma_analysis,
-        "rsi": round(rsi, 2) if rsi is not None else None,
-        "adx": round(adx, 2) if adx is not None else None,
-        "macd": macd,
-        "bollinger_bands": bollinger,
-        "atr": round(atr, 8) if atr is not None else None,
-        "last_price": round(last_price, 8),
-        "timestamp": int(df['close_time'].iloc[-1]),
+        "rsi": _none_if_nan(rsi),
+        "adx": _none_if_nan(adx),
+        "macd": _none_if_nan_values(macd),
+        "bollinger_bands": _none_if_nan_values(bollinger),
+        "atr": _none_if_nan(atr),
+        "last_price": last_price,
+        "timestamp": int(klines[-1][6]),
     }
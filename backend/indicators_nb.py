@@ -0,0 +1,270 @@
+"""
+Numba kernels for the indicator math
+
+Each kernel takes float64 ndarrays and returns only the last value of the
+pandas computation it replaces, carrying rolling windows and ewm(adjust=False)
+smoothing as scalar state in a single pass. Windows are NaN until full and
+ewm starts at the first non-NaN value, as in pandas. error_model="numpy"
+makes division by zero yield inf/NaN like pandas instead of raising.
+
+Kernels are declared with explicit signatures over C-contiguous float64
+arrays, so they compile (or load from the on-disk cache) at import time
+instead of on the first update. fastmath stays off: it assumes no NaNs,
+and the window warm-up relies on NaN propagation.
+
+Kernels that produce arrays write into caller-provided buffers at least as
+long as their input, so scratch space can be reused across calls.
+"""
+import numpy as np
+from numba import float64, int64, njit, prange
+from numba.types import UniTuple
+
+
+@njit(UniTuple(float64, 2)(float64, float64, float64, float64), cache=True, error_model="numpy")
+def _ewm_step(weighted, old_wt, x, alpha):
+    """One step of the pandas ewm(adjust=False) recurrence; returns (weighted, old_wt)"""
+    if np.isnan(weighted):
+        return x, 1.0
+    # A NaN gap keeps decaying the previous weight (ignore_na=False)
+    old_wt *= 1.0 - alpha
+    if np.isnan(x):
+        return weighted, old_wt
+    return (old_wt * weighted + alpha * x) / (old_wt + alpha), 1.0
+
+
+@njit(float64[::1](float64[::1], float64[::1], float64[::1], float64[::1]), cache=True, error_model="numpy")
+def true_range(high, low, close, out):
+    """True range into out, returning the filled view; the first bar has no previous close and uses high - low"""
+    tr = out[:len(high)]
+    if len(high) > 0:
+        tr[0] = high[0] - low[0]
+    for i in range(1, len(high)):
+        # max(high - low, |high - close_prev|, |low - close_prev|) without the abs
+        tr[i] = max(high[i], close[i - 1]) - min(low[i], close[i - 1])
+    return tr
+
+
+@njit(float64[::1](float64[::1], float64[::1]), cache=True, error_model="numpy")
+def diff(arr, out):
+    """Changes between consecutive values into out, returning the filled view"""
+    changes = out[:max(len(arr) - 1, 0)]
+    for i in range(len(changes)):
+        changes[i] = arr[i + 1] - arr[i]
+    return changes
+
+
+@njit(float64[::1](float64[::1], int64[::1]), cache=True, error_model="numpy")
+def trailing_means(arr, periods):
+    """
+    Mean of the last `period` values for each period; NaN where arr is shorter
+
+    One backward running sum serves every period, so the cost is
+    O(max(periods)) however many periods are requested.
+    """
+    out = np.full(len(periods), np.nan)
+    if len(periods) == 0:
+        return out
+    longest = min(periods.max(), len(arr))
+    total = 0.0
+    for i in range(longest):
+        total += arr[len(arr) - 1 - i]
+        for j in range(len(periods)):
+            if periods[j] == i + 1:
+                out[j] = total / periods[j]
+    return out
+
+
+@njit(UniTuple(float64, 2)(float64), cache=True, error_model="numpy")
+def _gain_loss(delta):
+    """(gain, loss) of one price change, from a single comparison chain"""
+    if delta > 0:
+        return delta, 0.0
+    if delta < 0:
+        return 0.0, -delta
+    # Zero, or NaN, which propagates into both as pandas clip does
+    return delta, delta
+
+
+@njit(float64(float64[::1], int64), cache=True, error_model="numpy")
+def rsi(deltas, period):
+    """Last RSI from close-to-close changes: rolling mean of gains/losses smoothed with ewm(span=period)"""
+    alpha = 2.0 / (period + 1.0)
+    sum_gain = 0.0
+    sum_loss = 0.0
+    avg_gain = np.nan
+    avg_loss = np.nan
+    avg_wt = 1.0
+    for i in range(len(deltas)):
+        gain, loss = _gain_loss(deltas[i])
+        sum_gain += gain
+        sum_loss += loss
+        if i >= period:
+            gain, loss = _gain_loss(deltas[i - period])
+            sum_gain -= gain
+            sum_loss -= loss
+        if i < period - 1:
+            continue
+
+        wt = avg_wt
+        avg_gain, avg_wt = _ewm_step(avg_gain, wt, sum_gain / period, alpha)
+        avg_loss, avg_wt = _ewm_step(avg_loss, wt, sum_loss / period, alpha)
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(float64(float64[::1], int64), cache=True, error_model="numpy")
+def atr(tr, period):
+    """Last ATR: rolling mean of true range smoothed with ewm(span=period)"""
+    alpha = 2.0 / (period + 1.0)
+    total = 0.0
+    value = np.nan
+    wt = 1.0
+    for i in range(len(tr)):
+        total += tr[i]
+        if i >= period:
+            total -= tr[i - period]
+        if i >= period - 1:
+            value, wt = _ewm_step(value, wt, total / period, alpha)
+    return value
+
+
+@njit(UniTuple(float64, 2)(float64[::1], float64[::1], int64), cache=True, error_model="numpy")
+def _directional_movement(high, low, i):
+    """(+DM, -DM) of bar i; the first bar has none"""
+    if i == 0:
+        return 0.0, 0.0
+    up = high[i] - high[i - 1]
+    down = low[i - 1] - low[i]
+    plus = up if up > 0 and up > down else 0.0
+    minus = down if down > 0 and down > up else 0.0
+    return plus, minus
+
+
+@njit(float64(float64[::1], float64[::1], float64[::1], int64), cache=True, error_model="numpy")
+def adx(high, low, tr, period):
+    """
+    Last ADX from rolling-sum smoothed directional movement and true range
+
+    The +DM, -DM and true range windows and their ewm smoothing run as three
+    accumulators in a single pass. Their sums are never NaN, so after the
+    first full window the ewm is the plain recurrence with hoisted weights.
+    The bar leaving each window has its DM recomputed rather than stored.
+    """
+    alpha = 2.0 / (period + 1.0)
+    decay = 1.0 - alpha
+    norm = decay + alpha
+    sum_plus = 0.0
+    sum_minus = 0.0
+    sum_tr = 0.0
+    smoothed_plus = 0.0
+    smoothed_minus = 0.0
+    smoothed_tr = 0.0
+    adx_value = np.nan
+    adx_wt = 1.0
+    for i in range(len(high)):
+        plus, minus = _directional_movement(high, low, i)
+        sum_plus += plus
+        sum_minus += minus
+        sum_tr += tr[i]
+        if i >= period:
+            plus, minus = _directional_movement(high, low, i - period)
+            sum_plus -= plus
+            sum_minus -= minus
+            sum_tr -= tr[i - period]
+        if i < period - 1:
+            continue
+
+        if i == period - 1:
+            # ewm starts at the first full window
+            smoothed_plus = sum_plus
+            smoothed_minus = sum_minus
+            smoothed_tr = sum_tr
+        else:
+            smoothed_plus = (decay * smoothed_plus + alpha * sum_plus) / norm
+            smoothed_minus = (decay * smoothed_minus + alpha * sum_minus) / norm
+            smoothed_tr = (decay * smoothed_tr + alpha * sum_tr) / norm
+
+        di_plus = smoothed_plus / smoothed_tr * 100
+        di_minus = smoothed_minus / smoothed_tr * 100
+        # DX is NaN when both DIs are 0, so its smoothing keeps the NaN-aware step
+        dx = abs(di_plus - di_minus) / (di_plus + di_minus) * 100
+        adx_value, adx_wt = _ewm_step(adx_value, adx_wt, dx, alpha)
+    return adx_value
+
+
+@njit(UniTuple(float64, 3)(float64[::1], int64, int64, int64), cache=True, error_model="numpy")
+def macd(close, fast, slow, signal):
+    """
+    Last MACD, signal and histogram values
+
+    The fast, slow and signal EMAs (ewm(span, adjust=False)) advance together
+    in one pass, so no intermediate series is materialized.
+    """
+    fast_alpha = 2.0 / (fast + 1.0)
+    slow_alpha = 2.0 / (slow + 1.0)
+    signal_alpha = 2.0 / (signal + 1.0)
+    ema_fast = np.nan
+    ema_slow = np.nan
+    ema_signal = np.nan
+    fast_wt = 1.0
+    slow_wt = 1.0
+    signal_wt = 1.0
+    line = np.nan
+    for i in range(len(close)):
+        ema_fast, fast_wt = _ewm_step(ema_fast, fast_wt, close[i], fast_alpha)
+        ema_slow, slow_wt = _ewm_step(ema_slow, slow_wt, close[i], slow_alpha)
+        line = ema_fast - ema_slow
+        ema_signal, signal_wt = _ewm_step(ema_signal, signal_wt, line, signal_alpha)
+    return line, ema_signal, line - ema_signal
+
+
+@njit(
+    UniTuple(float64, 6)(
+        float64[::1], float64[::1], float64[::1], float64[::1], float64[::1],
+        int64, int64, int64, int64, int64, int64
+    ),
+    cache=True,
+    error_model="numpy"
+)
+def latest_values(
+    high, low, close, tr_out, deltas_out, rsi_period, adx_period, atr_period, fast, slow, signal
+):
+    """Latest (RSI, ATR, ADX, MACD, signal, histogram) for one symbol, using the given scratch buffers"""
+    tr = true_range(high, low, close, tr_out)
+    macd_line, macd_signal, macd_histogram = macd(close, fast, slow, signal)
+    return (
+        rsi(diff(close, deltas_out), rsi_period),
+        atr(tr, atr_period),
+        adx(high, low, tr, adx_period),
+        macd_line,
+        macd_signal,
+        macd_histogram,
+    )
+
+
+@njit(
+    float64[:, ::1](
+        float64[:, ::1], float64[:, ::1], float64[:, ::1], float64[:, ::1], float64[:, ::1],
+        int64, int64, int64, int64, int64, int64
+    ),
+    cache=True,
+    parallel=True,
+    error_model="numpy"
+)
+def batch_latest_values(
+    high, low, close, tr_out, deltas_out, rsi_period, adx_period, atr_period, fast, slow, signal
+):
+    """
+    latest_values for every row of (symbols, bars) arrays, one row per thread
+
+    Each row uses the same row of the scratch buffers, which need at least
+    as many rows and columns as the inputs.
+    """
+    out = np.empty((high.shape[0], 6))
+    for i in prange(high.shape[0]):
+        values = latest_values(
+            high[i], low[i], close[i], tr_out[i], deltas_out[i],
+            rsi_period, adx_period, atr_period, fast, slow, signal
+        )
+        for j in range(6):
+            out[i, j] = values[j]
+    return out
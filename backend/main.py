@@ -1,11 +1,12 @@
 import os
-import json
 import logging
-import time
+import asyncio
 from datetime import datetime
+import orjson
 from dotenv import load_dotenv
 from binance_api import BinanceAPI
-from indicators import calculate_all_indicators
+from binance_ws import BinanceWSClient
+from indicators import IndicatorWorkspace, calculate_all_indicators_batch
 
 # Load environment variables
 load_dotenv()
@@ -23,62 +24,130 @@ API_SECRET = os.getenv("BINANCE_API_SECRET", "")
 INTERVAL = os.getenv("INTERVAL", "1h")
 CANDLE_LIMIT = int(os.getenv("CANDLE_LIMIT", 200))
 UPDATE_INTERVAL = int(os.getenv("UPDATE_INTERVAL", 5))  # seconds
+# Debounce after a streamed change so a burst of messages becomes one update
+MIN_UPDATE_INTERVAL = float(os.getenv("MIN_UPDATE_INTERVAL", 1))  # seconds
+
+# Pretty-printed output; numpy scalars serialize natively
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
 
 # Initialize API client
 binance = BinanceAPI(API_KEY, API_SECRET)
 
+# Push updates for tickers, mark prices and top-asset klines; REST is the fallback
+stream = BinanceWSClient(binance, INTERVAL, CANDLE_LIMIT)
+
+# Last computed indicators per (symbol, interval), keyed by the latest candle
+indicator_cache = {}
+
+# Scratch buffers shared by every indicator calculation on the update loop
+workspace = IndicatorWorkspace()
+
+
+async def fetch_klines(symbol: str) -> list:
+    """Get the klines window for a symbol, from the stream if live, or None on error"""
+    klines = stream.get_klines(symbol)
+    if klines is not None:
+        return klines
 
-def get_symbol_indicators(symbol: str) -> dict:
-    """Get indicators for a specific symbol"""
     try:
         logger.info(f"Fetching klines for {symbol}...")
-        klines = binance.get_klines(symbol, INTERVAL, CANDLE_LIMIT)
+        # Only candles from the last cached open time onwards are refetched
+        return await binance.get_klines(symbol, INTERVAL, CANDLE_LIMIT)
+    except Exception as e:
+        logger.error(f"Error fetching indicators for {symbol}: {str(e)}")
+        return None
 
-        indicators = calculate_all_indicators(klines)
 
+def compute_indicators(klines_by_symbol: dict) -> dict:
+    """
+    Get indicators per symbol, computing all changed windows in one batch
+
+    Earlier candles are closed, so an unchanged last candle means unchanged
+    indicators and the cached result is reused.
+    """
+    results = {}
+    stale = []
+    for symbol, klines in klines_by_symbol.items():
+        last_candle = tuple(klines[-1]) if klines else None
+        cached = indicator_cache.get((symbol, INTERVAL))
+        if cached and last_candle is not None and cached[0] == last_candle:
+            results[symbol] = cached[1]
+        else:
+            stale.append((symbol, klines, last_candle))
+
+    if stale:
+        computed = calculate_all_indicators_batch([klines for _, klines, _ in stale], workspace=workspace)
+        for (symbol, _, last_candle), indicators in zip(stale, computed):
+            indicator_cache[(symbol, INTERVAL)] = (last_candle, indicators)
+            results[symbol] = indicators
+
+    return results
+
+
+async def get_symbol_indicators(symbol: str) -> dict:
+    """Get indicators for a specific symbol"""
+    klines = await fetch_klines(symbol)
+    if klines is None:
+        return None
+
+    try:
         return {
             "symbol": symbol,
             "interval": INTERVAL,
-            "indicators": indicators,
+            "indicators": compute_indicators({symbol: klines})[symbol],
         }
     except Exception as e:
-        logger.error(f"Error fetching indicators for {symbol}: {str(e)}")
+        logger.error(f"Error calculating indicators for {symbol}: {str(e)}")
         return None
 
 
-def get_most_liquid_indicators() -> dict:
-    """Get indicators for the most liquid asset"""
-    try:
-        logger.info("Finding most liquid asset...")
-        most_liquid = binance.get_most_liquid_asset()
+async def get_most_liquid_indicators(most_liquid: dict, top_liquid: list = None) -> dict:
+    """
+    Get indicators for the most liquid asset from the liquidity snapshot
 
+    The most liquid asset heads the top-N list, so its result there is
+    reused instead of being fetched and computed a second time.
+    """
+    try:
         symbol = most_liquid.get("symbol", "UNKNOWN")
-        volume = float(most_liquid.get("quoteAssetVolume") or most_liquid.get("volume") or 0)
+        volume = float(most_liquid.get("volume_24h") or 0)
         
         logger.info(
             f"Most liquid asset: {symbol} "
             f"(Volume: ${volume:,.0f})"
         )
 
-        return get_symbol_indicators(symbol)
+        for result in top_liquid or []:
+            if result["symbol"] == symbol:
+                return result
+
+        return await get_symbol_indicators(symbol)
     except Exception as e:
         logger.error(f"Error getting most liquid indicators: {str(e)}")
         return None
 
 
-def get_top_liquid_indicators(count: int = 5) -> list:
-    """Get indicators for multiple top liquid assets"""
+async def get_top_liquid_indicators(top_assets: list) -> list:
+    """Get indicators for multiple top liquid assets from the liquidity snapshot"""
     try:
-        logger.info(f"Fetching top {count} liquid assets...")
-        top_assets = binance.get_top_liquid_assets(count)
-
+        logger.info(f"Fetching indicators for {', '.join(a['symbol'] for a in top_assets)}...")
+        # Fetch klines for all symbols concurrently, then compute them together
+        symbols = [asset["symbol"] for asset in top_assets]
+        klines_results = await asyncio.gather(*(fetch_klines(symbol) for symbol in symbols))
+        indicators = compute_indicators({
+            symbol: klines for symbol, klines in zip(symbols, klines_results) if klines is not None
+        })
+
+        # Keep the snapshot order
         results = []
         for asset in top_assets:
-            logger.info(f"Fetching indicators for {asset['symbol']}...")
-            result = get_symbol_indicators(asset["symbol"])
-            if result:
-                result["liquidity"] = asset
-                results.append(result)
+            if asset["symbol"] in indicators:
+                results.append({
+                    "symbol": asset["symbol"],
+                    "interval": INTERVAL,
+                    "indicators": indicators[asset["symbol"]],
+                    "liquidity": asset,
+                })
 
         return results
     except Exception as e:
@@ -86,30 +155,74 @@ def get_top_liquid_indicators(count: int = 5) -> list:
         return []
 
 
-def main():
+async def wait_for_next_update():
+    """
+    Wait until there is new data to process
+
+    While the stream is live this wakes on the next streamed change, then
+    waits MIN_UPDATE_INTERVAL so a burst of messages becomes one update.
+    UPDATE_INTERVAL bounds the wait, and is the polling period when the
+    stream is down and data comes from REST.
+    """
+    if not stream.is_live:
+        logger.info(f"\nNext update in {UPDATE_INTERVAL} seconds...")
+        await asyncio.sleep(UPDATE_INTERVAL)
+        return
+
+    try:
+        await asyncio.wait_for(stream.updated.wait(), timeout=UPDATE_INTERVAL)
+    except asyncio.TimeoutError:
+        return
+    await asyncio.sleep(MIN_UPDATE_INTERVAL)
+
+
+async def main():
     """Main execution with loop"""
     logger.info("=== Trading Bot Backend ===\n")
-    logger.info(f"Updating every {UPDATE_INTERVAL} seconds\n")
+    logger.info(f"Updating on streamed changes, at least every {UPDATE_INTERVAL} seconds\n")
 
+    stream_task = asyncio.ensure_future(stream.run())
     try:
         while True:
+            # Changes that land while updating trigger the next update
+            stream.updated.clear()
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+            # One liquidity snapshot feeds both the most-liquid and top-N views
+            logger.info("Fetching top 5 liquid assets...")
+            try:
+                if stream.is_live:
+                    snapshot = await stream.get_liquidity_snapshot(5)
+                else:
+                    snapshot = await binance.get_liquidity_snapshot(5)
+            except Exception as e:
+                logger.error(f"Error getting liquidity snapshot: {str(e)}")
+                snapshot = []
+
+            # Follow the current top assets' klines on the stream
+            await stream.watch_klines(asset["symbol"] for asset in snapshot[:5])
+
+            most_liquid, top_liquid = None, []
+            if snapshot:
+                top_liquid = await get_top_liquid_indicators(snapshot[:5])
+                most_liquid = await get_most_liquid_indicators(snapshot[0], top_liquid)
+
             logger.info(f"\n[{timestamp}] --- Most Liquid Asset ---")
-            most_liquid = get_most_liquid_indicators()
             if most_liquid:
-                print(json.dumps(most_liquid, indent=2))
+                print(orjson.dumps(most_liquid, option=JSON_OPTIONS).decode())
 
             logger.info(f"\n[{timestamp}] --- Top 5 Liquid Assets ---")
-            top_liquid = get_top_liquid_indicators(5)
             if top_liquid:
-                print(json.dumps(top_liquid, indent=2))
+                print(orjson.dumps(top_liquid, option=JSON_OPTIONS).decode())
 
-            logger.info(f"\nNext update in {UPDATE_INTERVAL} seconds...")
-            time.sleep(UPDATE_INTERVAL)
-
-    except KeyboardInterrupt:
-        logger.info("\n\nBot stopped by user")
+            await wait_for_next_update()
+    finally:
+        stream_task.cancel()
+        await binance.close()
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        logger.info("\n\nBot stopped by user")